@@ -195,6 +195,15 @@ GOOGLE_APPLICATION_CREDENTIALS = get_env_variable("GOOGLE_APPLICATION_CREDENTIAL
 # Mistral OCR settings
 MISTRAL_API_KEY = get_env_variable("MISTRAL_API_KEY", "")
 MISTRAL_OCR_MODEL = get_env_variable("MISTRAL_OCR_MODEL", "mistral-ocr-latest")
+MISTRAL_OCR_CONCURRENCY = int(get_env_variable("MISTRAL_OCR_CONCURRENCY", "8"))
+MISTRAL_OCR_MAX_ATTEMPTS = int(get_env_variable("MISTRAL_OCR_MAX_ATTEMPTS", "3"))
+MISTRAL_OCR_RPS = float(get_env_variable("MISTRAL_OCR_RPS", "5"))
+MISTRAL_OCR_INLINE_MAX_BYTES = int(
+    get_env_variable("MISTRAL_OCR_INLINE_MAX_BYTES", str(1024 * 1024))
+)
+PDF_MIN_TEXT_THRESHOLD = int(get_env_variable("PDF_MIN_TEXT_THRESHOLD", "100"))
+MISTRAL_OCR_CACHE_DIR = get_env_variable("MISTRAL_OCR_CACHE_DIR", None)
+MISTRAL_OCR_CACHE_SIZE = int(get_env_variable("MISTRAL_OCR_CACHE_SIZE", "128"))
 
 env_value = get_env_variable("RAG_CHECK_EMBEDDING_CTX_LENGTH", "True").lower()
 RAG_CHECK_EMBEDDING_CTX_LENGTH = True if env_value == "true" else False
@@ -36,6 +36,7 @@ from app.utils.document_loader import (
     clean_text,
     process_documents,
     cleanup_temp_encoding_file,
+    SafePyPDFLoader,
 )
 from app.utils.health import is_health_ok
 
@@ -93,7 +94,10 @@ async def load_file_content(
 ) -> tuple:
     """Load file content using appropriate loader."""
     loader, known_type, file_ext = get_loader(filename, content_type, file_path)
-    data = await run_in_executor(executor, loader.load)
+    if isinstance(loader, SafePyPDFLoader):
+        data = await loader.aload()
+    else:
+        data = await run_in_executor(executor, loader.load)
 
     # Clean up temporary UTF-8 file if it was created for encoding conversion
     cleanup_temp_encoding_file(loader)
@@ -418,7 +422,10 @@ async def embed_local_file(
         loader, known_type, file_ext = get_loader(
             document.filename, document.file_content_type, document.filepath
         )
-        data = await run_in_executor(request.app.state.thread_pool, loader.load)
+        if isinstance(loader, SafePyPDFLoader):
+            data = await loader.aload()
+        else:
+            data = await run_in_executor(request.app.state.thread_pool, loader.load)
 
         # Clean up temporary UTF-8 file if it was created for encoding conversion
         cleanup_temp_encoding_file(loader)
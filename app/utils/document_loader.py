@@ -1,15 +1,42 @@
 # app/utils/document_loader.py
 
 import os
+import re
+import json
+import time
+import atexit
 import codecs
+import hashlib
+import asyncio
 import tempfile
+import threading
+import weakref
 
-from typing import List, Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import AsyncIterator, Iterator, List, Optional
 import chardet
+import httpx
+from pypdf import PdfReader
 
 from langchain_core.documents import Document
 
-from app.config import known_source_ext, PDF_EXTRACT_IMAGES, CHUNK_OVERLAP, logger, MISTRAL_API_KEY, MISTRAL_OCR_MODEL
+from app.config import (
+    known_source_ext,
+    PDF_EXTRACT_IMAGES,
+    CHUNK_OVERLAP,
+    logger,
+    MISTRAL_API_KEY,
+    MISTRAL_OCR_MODEL,
+    MISTRAL_OCR_CONCURRENCY,
+    MISTRAL_OCR_MAX_ATTEMPTS,
+    MISTRAL_OCR_RPS,
+    MISTRAL_OCR_INLINE_MAX_BYTES,
+    PDF_MIN_TEXT_THRESHOLD,
+    MISTRAL_OCR_CACHE_DIR,
+    MISTRAL_OCR_CACHE_SIZE,
+)
 from langchain_community.document_loaders import (
     TextLoader,
     CSVLoader,
@@ -22,6 +49,146 @@ from langchain_community.document_loaders import (
     UnstructuredPowerPointLoader,
 )
 
+# Bounds the number of Mistral OCR requests in flight across concurrent aload() calls.
+# asyncio primitives bind to the loop that first waits on them, so keep one per loop.
+_OCR_SEMAPHORES = weakref.WeakKeyDictionary()
+
+
+def _get_ocr_semaphore() -> asyncio.Semaphore:
+    """Return the OCR concurrency semaphore of the running event loop."""
+    loop = asyncio.get_running_loop()
+    semaphore = _OCR_SEMAPHORES.get(loop)
+    if semaphore is None:
+        semaphore = _OCR_SEMAPHORES[loop] = asyncio.Semaphore(MISTRAL_OCR_CONCURRENCY)
+    return semaphore
+
+_TRANSIENT_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+# Statuses that prove a request was turned away before the server acted on it
+_REJECTED_STATUS_CODES = {408, 429}
+_TRANSIENT_MESSAGE = re.compile(r"rate.?limit|overloaded|quota", re.IGNORECASE)
+_RETRY_MIN_WAIT = 1
+_RETRY_MAX_WAIT = 16
+
+# Number of leading pages checked for an extractable text layer before OCR
+_TEXT_PROBE_PAGES = 3
+# Pages with less text than this are treated as scans without a text layer
+_MIN_PAGE_TEXT_CHARS = 20
+
+_BATCH_TERMINAL_STATUSES = {"SUCCESS", "FAILED", "TIMEOUT_EXCEEDED", "CANCELLED"}
+_BATCH_POLL_MIN_WAIT = 1
+_BATCH_POLL_MAX_WAIT = 60
+# Batch jobs are cancelled after this long; signed URLs they read must outlive it
+_BATCH_TIMEOUT_HOURS = 24
+
+
+class _RateLimiter:
+    """
+    Token bucket allowing `max_rate` acquisitions per `time_period` seconds.
+
+    Shared by the sync (worker thread) and async OCR paths: the bucket is
+    guarded by a thread lock and callers sleep outside of it. A `max_rate`
+    of 0 or less disables limiting.
+    """
+
+    def __init__(self, max_rate: float, time_period: float = 1.0):
+        self.max_rate = max_rate
+        self._rate = max_rate / time_period
+        self._capacity = max(max_rate, 1.0)
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take a token and return how many seconds to wait until it is due."""
+        if self.max_rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self._capacity, self._tokens + (now - self._updated) * self._rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            return max(-self._tokens / self._rate, 0.0)
+
+    def acquire(self) -> None:
+        delay = self._reserve()
+        if delay:
+            time.sleep(delay)
+
+    async def acquire_async(self) -> None:
+        delay = self._reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+
+# Spaces out OCR requests so bursts of uploads stay under the Mistral rate limit
+_OCR_RATE_LIMITER = _RateLimiter(MISTRAL_OCR_RPS)
+
+
+class _OCRCache:
+    """
+    Key-value store for serialized OCR results.
+
+    Entries are JSON files under `cache_dir` when it is set, so they survive
+    restarts and are shared between workers; otherwise they live in a
+    per-process LRU dict holding at most `max_size` entries.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_size: int = 128):
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, re.sub(r"[^\w.-]", "_", key) + ".json")
+
+    def get(self, key: str) -> Optional[list]:
+        if self.cache_dir:
+            try:
+                with open(self._path(key), "r", encoding="utf-8") as f:
+                    return json.load(f)
+            except FileNotFoundError:
+                return None
+            except Exception as e:
+                logger.warning(f"Failed to read OCR cache entry {key}: {e}")
+                return None
+
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: list) -> None:
+        if self.cache_dir:
+            temp_file = None
+            try:
+                with tempfile.NamedTemporaryFile(
+                    "w", encoding="utf-8", dir=self.cache_dir, delete=False
+                ) as temp_file:
+                    json.dump(value, temp_file)
+                os.replace(temp_file.name, self._path(key))
+            except Exception as e:
+                logger.warning(f"Failed to write OCR cache entry {key}: {e}")
+                if temp_file and os.path.exists(temp_file.name):
+                    os.unlink(temp_file.name)
+            return
+
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+
+_OCR_CACHE = _OCRCache(MISTRAL_OCR_CACHE_DIR, MISTRAL_OCR_CACHE_SIZE)
+
 
 def detect_file_encoding(filepath: str) -> str:
     """
@@ -216,6 +383,126 @@ def process_documents(documents: List[Document]) -> str:
     return processed_text.strip()
 
 
+# Deleting uploaded files from Mistral is off the critical path: callers only need
+# the OCR result, so deletes run in the background and are drained at exit.
+_CLEANUP_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="mistral-cleanup")
+atexit.register(_CLEANUP_POOL.shutdown, wait=True)
+
+
+def _safe_delete(client, file_id: str) -> None:
+    """Delete a file from Mistral storage, logging instead of raising on failure."""
+    try:
+        client.files.delete(file_id=file_id)
+    except Exception as e:
+        logger.warning(f"Failed to delete uploaded file {file_id} from Mistral: {e}")
+
+
+@lru_cache(maxsize=4)
+def _get_mistral_client(api_key: str):
+    """
+    Return a shared Mistral client for the given API key.
+
+    Reusing the client keeps its HTTP connection pools (and TLS sessions) warm
+    across files instead of opening new connections for every PDF.
+    """
+    from mistralai import Mistral
+
+    return Mistral(api_key=api_key)
+
+
+_ASYNC_MISTRAL_CLIENTS = weakref.WeakKeyDictionary()
+
+def _get_async_mistral_client(api_key: str):
+    """
+    Return the Mistral client for async calls on the running event loop.
+
+    httpx.AsyncClient connections are bound to the loop that opened them, so
+    each loop gets its own client; it is dropped along with the loop.
+    """
+    clients = _ASYNC_MISTRAL_CLIENTS.setdefault(asyncio.get_running_loop(), {})
+    client = clients.get(api_key)
+    if client is None:
+        from mistralai import Mistral
+
+        client = clients[api_key] = Mistral(api_key=api_key)
+    return client
+
+
+def _iter_batch_records(response) -> Iterator[dict]:
+    """Yield the JSON records of a downloaded Mistral batch output or error file."""
+    for line in response.iter_lines():
+        if line.strip():
+            yield json.loads(line)
+
+
+def _is_transient(e: Exception) -> bool:
+    """Whether a Mistral API error is worth retrying (timeouts, rate limits, overloads)."""
+    if isinstance(e, httpx.TransportError):
+        return True
+    if getattr(e, "status_code", None) in _TRANSIENT_STATUS_CODES:
+        return True
+    return bool(_TRANSIENT_MESSAGE.search(str(e)))
+
+
+def _is_rejected(e: Exception) -> bool:
+    """
+    Whether a Mistral API error proves the request was not accepted.
+
+    Used instead of `_is_transient` for calls that must not run twice: after a
+    timeout or dropped connection the server may already have acted on them.
+    """
+    return getattr(e, "status_code", None) in _REJECTED_STATUS_CODES
+
+
+def _retry_delay(e: Exception, attempt: int) -> float:
+    """
+    Seconds to wait before retrying a failed call.
+
+    :param e: The transient error
+    :param attempt: 1-based number of the attempt that failed
+    :return: The server's Retry-After value when given, else an exponential backoff,
+        never more than _RETRY_MAX_WAIT seconds
+    """
+    headers = getattr(getattr(e, "raw_response", None), "headers", None) or {}
+    retry_after = headers.get("retry-after")
+    if retry_after:
+        try:
+            return min(max(float(retry_after), 0.0), _RETRY_MAX_WAIT)
+        except ValueError:
+            pass  # HTTP-date form, fall back to backoff
+    return min(_RETRY_MIN_WAIT * 2 ** (attempt - 1), _RETRY_MAX_WAIT)
+
+
+def _call_with_retry(func, *args, is_retryable=_is_transient, **kwargs):
+    """Call a Mistral client method, retrying errors `is_retryable` accepts with backoff."""
+    for attempt in range(1, MISTRAL_OCR_MAX_ATTEMPTS + 1):
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            if attempt >= MISTRAL_OCR_MAX_ATTEMPTS or not is_retryable(e):
+                raise
+            delay = _retry_delay(e, attempt)
+            logger.warning(
+                f"Transient Mistral API error (attempt {attempt}/{MISTRAL_OCR_MAX_ATTEMPTS}), retrying in {delay:.1f}s: {e}"
+            )
+            time.sleep(delay)
+
+
+async def _acall_with_retry(func, *args, is_retryable=_is_transient, **kwargs):
+    """Async counterpart of `_call_with_retry` for the Mistral async client."""
+    for attempt in range(1, MISTRAL_OCR_MAX_ATTEMPTS + 1):
+        try:
+            return await func(*args, **kwargs)
+        except Exception as e:
+            if attempt >= MISTRAL_OCR_MAX_ATTEMPTS or not is_retryable(e):
+                raise
+            delay = _retry_delay(e, attempt)
+            logger.warning(
+                f"Transient Mistral API error (attempt {attempt}/{MISTRAL_OCR_MAX_ATTEMPTS}), retrying in {delay:.1f}s: {e}"
+            )
+            await asyncio.sleep(delay)
+
+
 class SafePyPDFLoader:
     """
     Replacement for previous PyPDF-based loader that now uses Mistral OCR API.
@@ -224,8 +511,25 @@ class SafePyPDFLoader:
     It returns one Document per page with metadata similar to PyPDFLoader:
     - metadata.source: original filepath
     - metadata.page: 1-based page index
+    - metadata.extraction_method: "mistral_ocr" or "pypdf_fast_path"
 
     Images are not extracted.
+
+    Use `aload()` from async code: it awaits the OCR call on Mistral's async
+    client instead of blocking a worker thread, and at most
+    MISTRAL_OCR_CONCURRENCY OCR requests are in flight per process. Both
+    paths start at most MISTRAL_OCR_RPS requests per second.
+
+    Born-digital PDFs skip OCR: when the first pages already hold at least
+    PDF_MIN_TEXT_THRESHOLD characters of text, pages are read locally with
+    pypdf instead.
+
+    PDFs larger than MISTRAL_OCR_INLINE_MAX_BYTES are streamed to the Mistral
+    files API from disk rather than base64-encoded in memory, OCRed via a
+    signed URL and deleted in the background afterwards.
+
+    Results are cached by the SHA-256 of the file, so loading a PDF that was
+    already OCRed with the same model does not call the API again.
     """
 
     def __init__(self, filepath: str, extract_images: bool = False):
@@ -240,10 +544,19 @@ class SafePyPDFLoader:
         with open(self.filepath, "rb") as f:
             return base64.b64encode(f.read()).decode("utf-8")
 
-    def load(self) -> List[Document]:
+    def _get_client(self):
+        self._check_mistral_config()
+        return _get_mistral_client(MISTRAL_API_KEY)
+
+    def _get_async_client(self):
+        self._check_mistral_config()
+        return _get_async_mistral_client(MISTRAL_API_KEY)
+
+    @staticmethod
+    def _check_mistral_config() -> None:
         # Lazy import to avoid hard dependency at import time
         try:
-            from mistralai import Mistral
+            from mistralai import Mistral  # noqa: F401
         except Exception as e:
             raise RuntimeError(
                 "mistralai package is required for PDF OCR. Please install 'mistralai' and set MISTRAL_API_KEY."
@@ -254,53 +567,396 @@ class SafePyPDFLoader:
                 "MISTRAL_API_KEY is not set. Please configure it in environment variables."
             )
 
-        base64_pdf = self._encode_pdf_b64()
-        client = Mistral(api_key=MISTRAL_API_KEY)
+    def _ocr_document(self) -> dict:
+        return {
+            "type": "document_url",
+            "document_url": f"data:application/pdf;base64,{self._encode_pdf_b64()}",
+        }
+
+    def _should_upload(self) -> bool:
+        return os.path.getsize(self.filepath) > MISTRAL_OCR_INLINE_MAX_BYTES
+
+    def _upload(self, client) -> str:
+        def upload():
+            # httpx streams file objects into the multipart body chunk by chunk
+            with open(self.filepath, "rb") as pdf_file:
+                return client.files.upload(
+                    file={"file_name": os.path.basename(self.filepath), "content": pdf_file},
+                    purpose="ocr",
+                )
 
-        try:
-            ocr_response = client.ocr.process(
+        return _call_with_retry(upload).id
+
+    def _uploaded_document(self, client, file_id: str, expiry_hours: int = 24) -> dict:
+        signed_url = _call_with_retry(
+            client.files.get_signed_url, file_id=file_id, expiry=expiry_hours
+        )
+        return {"type": "document_url", "document_url": signed_url.url}
+
+    async def _auploaded_document(self, client, file_id: str) -> dict:
+        signed_url = await _acall_with_retry(
+            client.files.get_signed_url_async, file_id=file_id
+        )
+        return {"type": "document_url", "document_url": signed_url.url}
+
+    def _process_ocr(self, client, document: dict):
+        def process():
+            _OCR_RATE_LIMITER.acquire()
+            return client.ocr.process(
                 model=MISTRAL_OCR_MODEL,
-                document={
-                    "type": "document_url",
-                    "document_url": f"data:application/pdf;base64,{base64_pdf}",
-                },
+                document=document,
                 include_image_base64=False,
             )
+
+        return _call_with_retry(process)
+
+    async def _aprocess_ocr(self, client, document: dict):
+        async def process():
+            await _OCR_RATE_LIMITER.acquire_async()
+            return await client.ocr.process_async(
+                model=MISTRAL_OCR_MODEL,
+                document=document,
+                include_image_base64=False,
+            )
+
+        return await _acall_with_retry(process)
+
+    def _cache_key(self) -> str:
+        with open(self.filepath, "rb") as f:
+            digest = hashlib.file_digest(f, "sha256").hexdigest()
+        return f"mistral_ocr:{MISTRAL_OCR_MODEL}:{digest}"
+
+    def _load_cached(self, cache_key: str) -> Optional[List[Document]]:
+        cached = _OCR_CACHE.get(cache_key)
+        if cached is None:
+            return None
+        logger.debug(f"Using cached OCR result for {self.filepath}")
+        return [
+            Document(
+                page_content=item["page_content"],
+                metadata={**item["metadata"], "source": self.filepath},
+            )
+            for item in cached
+        ]
+
+    def _store_cached(self, cache_key: str, documents: List[Document]) -> None:
+        # Don't cache the empty placeholder returned for failed extractions
+        if not any(doc.page_content for doc in documents):
+            return
+        _OCR_CACHE.set(
+            cache_key,
+            [
+                {"page_content": doc.page_content, "metadata": dict(doc.metadata)}
+                for doc in documents
+            ],
+        )
+
+    def _ocr(self):
+        client = self._get_client()
+        file_id = None
+
+        try:
+            if self._should_upload():
+                file_id = self._upload(client)
+                document = self._uploaded_document(client, file_id)
+            else:
+                document = self._ocr_document()
+            return self._process_ocr(client, document)
         except Exception as e:
             logger.error(f"Mistral OCR API call failed: {e}")
             raise
+        finally:
+            if file_id:
+                _CLEANUP_POOL.submit(_safe_delete, client, file_id)
+
+    async def _aocr(self):
+        # Uploads and deletes run in worker threads on the shared sync client
+        client = self._get_client()
+        async_client = self._get_async_client()
+
+        async with _get_ocr_semaphore():
+            file_id = None
+            try:
+                if await asyncio.to_thread(self._should_upload):
+                    # The SDK streams the file object from the calling thread, so upload
+                    # with the sync client off the event loop rather than on it
+                    file_id = await asyncio.to_thread(self._upload, client)
+                    document = await self._auploaded_document(async_client, file_id)
+                else:
+                    document = await asyncio.to_thread(self._ocr_document)
+                return await self._aprocess_ocr(async_client, document)
+            except Exception as e:
+                logger.error(f"Mistral OCR API call failed: {e}")
+                raise
+            finally:
+                if file_id:
+                    _CLEANUP_POOL.submit(_safe_delete, client, file_id)
+
+    def _quick_text_probe(
+        self, reader: PdfReader, max_pages: int = _TEXT_PROBE_PAGES
+    ) -> Optional[List[str]]:
+        """
+        Extract the text of the first pages to decide whether OCR is needed.
+
+        PDFs shorter than `max_pages` need a proportionally smaller share of
+        PDF_MIN_TEXT_THRESHOLD.
+
+        :param reader: Reader opened on the PDF
+        :param max_pages: Number of leading pages to sample
+        :return: Text of the sampled pages, or None if it is too sparse to skip OCR
+        """
+        probe_pages = min(max_pages, len(reader.pages))
+        texts = [reader.pages[i].extract_text() or "" for i in range(probe_pages)]
+        required_chars = PDF_MIN_TEXT_THRESHOLD * probe_pages / max_pages
+        if not probe_pages or sum(len(text) for text in texts) < required_chars:
+            return None
+        return texts
+
+    def _extract_text_layer(self) -> Optional[List[Document]]:
+        """Return the PDF's own text as page documents, or None if it needs OCR."""
+        if PDF_MIN_TEXT_THRESHOLD <= 0:
+            return None
+
+        try:
+            reader = PdfReader(self.filepath)
+            texts = self._quick_text_probe(reader)
+            if texts is None:
+                return None
+
+            # Sampled pages are already extracted; only parse the remainder
+            texts += [page.extract_text() or "" for page in reader.pages[len(texts):]]
+        except Exception as e:
+            logger.warning(
+                f"Local text extraction failed for {self.filepath}, falling back to OCR: {e}"
+            )
+            return None
+
+        # A typed cover can pass the probe while later pages are scanned images
+        sparse_pages = [
+            i + 1 for i, text in enumerate(texts) if len(text.strip()) < _MIN_PAGE_TEXT_CHARS
+        ]
+        if sparse_pages:
+            logger.warning(
+                f"Pages {sparse_pages} of {self.filepath} have no usable text layer, falling back to OCR"
+            )
+            return None
+
+        base_meta = {"source": self.filepath, "extraction_method": "pypdf_fast_path"}
+        return [
+            Document(page_content=text, metadata=base_meta | {"page": i + 1})
+            for i, text in enumerate(texts)
+        ]
+
+    def lazy_load(self) -> Iterator[Document]:
+        """Yield one Document per page, without waiting for the caller to collect them all."""
+        cache_key = self._cache_key()
+        cached = self._load_cached(cache_key)
+        if cached is not None:
+            yield from cached
+            return
+
+        text_layer = self._extract_text_layer()
+        if text_layer is not None:
+            yield from text_layer
+            return
 
-        pages = getattr(ocr_response, "pages", None)
+        documents: List[Document] = []
+        for document in self._iter_documents(self._ocr()):
+            documents.append(document)
+            yield document
+        self._store_cached(cache_key, documents)
+
+    async def alazy_load(self) -> AsyncIterator[Document]:
+        """Async counterpart of `lazy_load` using Mistral's async client."""
+        cache_key = await asyncio.to_thread(self._cache_key)
+        cached = await asyncio.to_thread(self._load_cached, cache_key)
+        if cached is not None:
+            for document in cached:
+                yield document
+            return
+
+        text_layer = await asyncio.to_thread(self._extract_text_layer)
+        if text_layer is not None:
+            for document in text_layer:
+                yield document
+            return
+
+        documents: List[Document] = []
+        for document in self._iter_documents(await self._aocr()):
+            documents.append(document)
+            yield document
+        await asyncio.to_thread(self._store_cached, cache_key, documents)
+
+    def load(self) -> List[Document]:
+        return list(self.lazy_load())
+
+    async def aload(self) -> List[Document]:
+        return [document async for document in self.alazy_load()]
+
+    @classmethod
+    def batch_load(cls, filepaths: List[str]) -> Iterator[Document]:
+        """
+        OCR many PDFs as a single Mistral batch job and yield their pages.
+
+        Meant for bulk (re)indexing where latency matters less than cost: the
+        job is billed at batch pricing and replaces one OCR request per file.
+        Cached and born-digital files are yielded up front and left out of
+        the job. Pages of each file are yielded together, in the order the job
+        reports them. Once all results are yielded, a RuntimeError lists every
+        file the job failed on or returned nothing for. The job times out after
+        _BATCH_TIMEOUT_HOURS; signed URLs of uploaded files are requested to
+        stay valid an hour longer than that.
+
+        :param filepaths: Paths of the PDF files to load
+        :return: Iterator over page documents of all files
+        """
+        loaders = [cls(filepath) for filepath in filepaths]
+        pending = {}
+        for loader in loaders:
+            cache_key = loader._cache_key()
+            documents = loader._load_cached(cache_key)
+            if documents is None:
+                documents = loader._extract_text_layer()
+            if documents is not None:
+                yield from documents
+            else:
+                pending[str(len(pending))] = (loader, cache_key)
+
+        if not pending:
+            return
+
+        client = loaders[0]._get_client()
+        uploaded_ids = []
+        try:
+            batch_path = None
+            try:
+                with tempfile.NamedTemporaryFile(
+                    "w", encoding="utf-8", suffix=".jsonl", delete=False
+                ) as batch_file:
+                    batch_path = batch_file.name
+                    for custom_id, (loader, _) in pending.items():
+                        if loader._should_upload():
+                            file_id = loader._upload(client)
+                            uploaded_ids.append(file_id)
+                            # The job may sit queued for its whole timeout before reading the URL
+                            document = loader._uploaded_document(
+                                client, file_id, expiry_hours=_BATCH_TIMEOUT_HOURS + 1
+                            )
+                        else:
+                            document = loader._ocr_document()
+                        request = {
+                            "custom_id": custom_id,
+                            "body": {"document": document, "include_image_base64": False},
+                        }
+                        batch_file.write(json.dumps(request) + "\n")
+
+                with open(batch_path, "rb") as f:
+                    batch_input = _call_with_retry(
+                        client.files.upload,
+                        file={"file_name": "ocr_batch.jsonl", "content": f},
+                        purpose="batch",
+                    )
+            finally:
+                if batch_path:
+                    os.remove(batch_path)
+            uploaded_ids.append(batch_input.id)
+
+            # A retried create after a lost response could start a second billed job
+            job = _call_with_retry(
+                client.batch.jobs.create,
+                is_retryable=_is_rejected,
+                input_files=[batch_input.id],
+                endpoint="/v1/ocr",
+                model=MISTRAL_OCR_MODEL,
+                timeout_hours=_BATCH_TIMEOUT_HOURS,
+            )
+            wait = _BATCH_POLL_MIN_WAIT
+            while job.status not in _BATCH_TERMINAL_STATUSES:
+                time.sleep(wait)
+                wait = min(wait * 2, _BATCH_POLL_MAX_WAIT)
+                job = _call_with_retry(client.batch.jobs.get, job_id=job.id)
+
+            completed = set()
+            failures = {}
+            if job.output_file:
+                uploaded_ids.append(job.output_file)
+                output = _call_with_retry(client.files.download, file_id=job.output_file)
+                try:
+                    for result in _iter_batch_records(output):
+                        custom_id = result["custom_id"]
+                        response = result.get("response") or {}
+                        if response.get("status_code") != 200:
+                            failures[custom_id] = result.get("error") or response
+                            continue
+
+                        loader, cache_key = pending[custom_id]
+                        documents = list(loader._iter_documents(response.get("body")))
+                        loader._store_cached(cache_key, documents)
+                        completed.add(custom_id)
+                        yield from documents
+                finally:
+                    output.close()
+
+            # Failed requests are written to a separate error file, not the output file
+            if job.error_file:
+                uploaded_ids.append(job.error_file)
+                errors = _call_with_retry(client.files.download, file_id=job.error_file)
+                try:
+                    for result in _iter_batch_records(errors):
+                        failures[result["custom_id"]] = result.get("error") or result.get("response")
+                finally:
+                    errors.close()
+
+            missing = [custom_id for custom_id in pending if custom_id not in completed]
+            if missing:
+                details = "; ".join(
+                    f"{pending[custom_id][0].filepath}: {failures.get(custom_id, 'no result returned')}"
+                    for custom_id in missing
+                )
+                raise RuntimeError(
+                    f"Mistral OCR batch job {job.id} finished with status {job.status} "
+                    f"and failed for {len(missing)} of {len(pending)} files: {details}"
+                )
+        finally:
+            for file_id in uploaded_ids:
+                _CLEANUP_POOL.submit(_safe_delete, client, file_id)
+
+    def _iter_documents(self, ocr_response) -> Iterator[Document]:
         # Some clients return dict-like response; handle both
-        if pages is None and isinstance(ocr_response, dict):
+        if isinstance(ocr_response, dict):
             pages = ocr_response.get("pages")
+        else:
+            pages = getattr(ocr_response, "pages", None)
+
+        base_meta = {"source": self.filepath, "extraction_method": "mistral_ocr"}
 
         if not pages:
             # Return an empty single document to avoid downstream crashes
-            return [
-                Document(
-                    page_content="",
-                    metadata={"source": self.filepath, "page": 1},
-                )
-            ]
+            yield Document(page_content="", metadata=base_meta | {"page": 1})
+            return
 
-        documents: List[Document] = []
-        for page in pages:
+        for position, page in enumerate(pages, start=1):
             # Handle both object and dict access
-            index = getattr(page, "index", None) if not isinstance(page, dict) else page.get("index")
-            markdown = getattr(page, "markdown", None) if not isinstance(page, dict) else page.get("markdown")
-            if index is None:
-                # Default to 1-based index progression
-                index = len(documents) + 1
-            content = markdown or ""
-            documents.append(
-                Document(
-                    page_content=content,
-                    metadata={
-                        "source": self.filepath,
-                        "page": index,
-                    },
-                )
-            )
+            if isinstance(page, dict):
+                index, markdown = page.get("index"), page.get("markdown")
+            else:
+                index = getattr(page, "index", None)
+                markdown = getattr(page, "markdown", None)
+            # Mistral page indexes are 0-based; pages are numbered from 1 like the pypdf path
+            page_number = index + 1 if index is not None else position
+            yield Document(page_content=markdown or "", metadata=base_meta | {"page": page_number})
+
 
-        return documents
+async def aload_pdfs(filepaths: List[str]) -> List[List[Document]]:
+    """
+    OCR several PDFs concurrently.
+
+    Requests overlap on the event loop; the per-loop OCR semaphore keeps the
+    number of in-flight OCR calls at MISTRAL_OCR_CONCURRENCY.
+
+    :param filepaths: Paths of the PDF files to load
+    :return: Loaded documents, one list per input file, in input order
+    """
+    return await asyncio.gather(
+        *(SafePyPDFLoader(filepath).aload() for filepath in filepaths)
+    )
@@ -1,7 +1,114 @@
 import os
+import json
+import asyncio
+import inspect
+import httpx
+import pytest
+from types import SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor
+from app.utils import document_loader
 from app.utils.document_loader import get_loader, clean_text, process_documents
+from app.utils.document_loader import SafePyPDFLoader, _OCRCache
 from langchain_core.documents import Document
 
+
+class FakeMistralClient:
+    """
+    Stand-in for the Mistral SDK client used by SafePyPDFLoader.
+
+    Every call is recorded in `calls` as (name, kwargs). Responses are keyed by
+    endpoint name without the `_async` suffix (e.g. "ocr.process") and may be a
+    value, an exception to raise, a callable taking the call kwargs, or a list
+    of those consumed one per call. Async endpoints await coroutine results.
+    """
+
+    def __init__(self, **responses):
+        self.responses = {name.replace("__", "."): value for name, value in responses.items()}
+        self.calls = []
+        self.ocr = _FakeEndpoint(self, "ocr")
+        self.files = _FakeEndpoint(self, "files")
+        self.batch = SimpleNamespace(jobs=_FakeEndpoint(self, "batch.jobs"))
+
+    def names(self):
+        return [name for name, _ in self.calls]
+
+    def respond(self, name, kwargs):
+        self.calls.append((name, kwargs))
+        response = self.responses.get(name.removesuffix("_async"))
+        if isinstance(response, list):
+            response = response.pop(0)
+        if isinstance(response, BaseException):
+            raise response
+        if callable(response):
+            return response(**kwargs)
+        return response
+
+
+class _FakeEndpoint:
+    def __init__(self, client, prefix):
+        self._client = client
+        self._prefix = prefix
+
+    def __getattr__(self, method):
+        name = f"{self._prefix}.{method}"
+        if method.endswith("_async"):
+            async def call_async(**kwargs):
+                response = self._client.respond(name, kwargs)
+                if inspect.isawaitable(response):
+                    response = await response
+                return response
+
+            return call_async
+        return lambda **kwargs: self._client.respond(name, kwargs)
+
+
+def ocr_response(*markdowns):
+    """Build an OCR response dict with one 0-based page per markdown string."""
+    return {"pages": [{"index": i, "markdown": md} for i, md in enumerate(markdowns)]}
+
+
+@pytest.fixture(autouse=True)
+def ocr_cache(monkeypatch):
+    """Give every test an empty in-memory OCR cache."""
+    cache = _OCRCache()
+    monkeypatch.setattr(document_loader, "_OCR_CACHE", cache)
+    return cache
+
+
+@pytest.fixture
+def mistral_client(monkeypatch):
+    """Install a FakeMistralClient with the given canned responses on SafePyPDFLoader."""
+
+    def install(**responses):
+        client = FakeMistralClient(**responses)
+        monkeypatch.setattr(SafePyPDFLoader, "_get_client", lambda self: client)
+        monkeypatch.setattr(SafePyPDFLoader, "_get_async_client", lambda self: client)
+        return client
+
+    return install
+
+
+@pytest.fixture
+def cleanup_pool(monkeypatch):
+    """Run background Mistral deletes on a pool the test can drain."""
+    pool = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(document_loader, "_CLEANUP_POOL", pool)
+    yield pool
+    pool.shutdown(wait=True)
+
+
+@pytest.fixture
+def pdf_file(tmp_path):
+    """Write a (non-parsable) PDF stub so loaders fall through to OCR."""
+
+    def write(name="test.pdf", content=b"%PDF-1.4 stub"):
+        path = tmp_path / name
+        path.write_bytes(content)
+        return str(path)
+
+    return write
+
+
 def test_clean_text():
     text = "Hello\x00World"
     cleaned = clean_text(text)
@@ -31,8 +138,6 @@ def test_process_documents():
 
 def test_safe_pdf_loader_class():
     """Test that SafePyPDFLoader class can be instantiated"""
-    from app.utils.document_loader import SafePyPDFLoader
-
     # Test instantiation
     loader = SafePyPDFLoader("dummy.pdf", extract_images=True)
     assert loader.filepath == "dummy.pdf"
@@ -48,7 +153,394 @@ def test_get_loader_pdf(tmp_path):
     loader, known_type, file_ext = get_loader("test.pdf", "application/pdf", str(file_path))
 
     # Check that we get our SafePyPDFLoader
-    from app.utils.document_loader import SafePyPDFLoader
     assert isinstance(loader, SafePyPDFLoader)
     assert known_type is True
-    assert file_ext == "pdf"
\ No newline at end of file
+    assert file_ext == "pdf"
+
+@pytest.mark.asyncio
+async def test_safe_pdf_loader_aload(pdf_file, mistral_client):
+    """Test that aload() awaits the async OCR call and maps pages to documents"""
+    path = pdf_file()
+    client = mistral_client(ocr__process=ocr_response("First", "Second"))
+
+    docs = await SafePyPDFLoader(path).aload()
+
+    assert client.names() == ["ocr.process_async"]
+    assert client.calls[0][1]["document"]["document_url"].startswith("data:application/pdf;base64,")
+    assert [d.page_content for d in docs] == ["First", "Second"]
+    assert [d.metadata["page"] for d in docs] == [1, 2]
+    assert all(d.metadata["source"] == path for d in docs)
+
+
+def test_aload_pdfs_caps_concurrent_ocr_calls(pdf_file, mistral_client, monkeypatch):
+    """Test that aload_pdfs never has more than MISTRAL_OCR_CONCURRENCY OCR calls in flight"""
+    from app.utils.document_loader import _RateLimiter, aload_pdfs
+
+    monkeypatch.setattr(document_loader, "MISTRAL_OCR_CONCURRENCY", 2)
+    monkeypatch.setattr(document_loader, "_OCR_RATE_LIMITER", _RateLimiter(0))
+    monkeypatch.setattr(document_loader, "_OCR_CACHE", _OCRCache(max_size=0))
+    in_flight = peak = 0
+
+    async def process(**kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return ocr_response("Page")
+
+    client = mistral_client(ocr__process=process)
+    paths = [pdf_file(f"{i}.pdf") for i in range(5)]
+
+    # Each asyncio.run() is a new event loop that needs its own semaphore
+    for _ in range(2):
+        results = asyncio.run(aload_pdfs(paths))
+        assert [docs[0].metadata["source"] for docs in results] == paths
+
+    assert len(client.calls) == 10
+    assert peak == 2
+
+
+def test_aload_pdfs_reuses_real_sdk_across_event_loops(pdf_file, monkeypatch):
+    """Test that repeated asyncio.run(aload_pdfs(...)) calls work through the real Mistral SDK"""
+    pytest.importorskip("mistralai")
+    from app.utils.document_loader import _RateLimiter, aload_pdfs
+
+    monkeypatch.setattr(document_loader, "MISTRAL_API_KEY", "test-key")
+    monkeypatch.setattr(document_loader, "_OCR_RATE_LIMITER", _RateLimiter(0))
+    monkeypatch.setattr(document_loader, "_OCR_CACHE", _OCRCache(max_size=0))
+    requests = []
+
+    class LoopBoundTransport(httpx.AsyncBaseTransport):
+        """Mock transport that, like a real connection pool, only works on its first loop."""
+
+        def __init__(self):
+            self.loop = None
+
+        async def handle_async_request(self, request):
+            loop = asyncio.get_running_loop()
+            self.loop = self.loop or loop
+            if loop is not self.loop:
+                raise RuntimeError("Event loop is closed")
+            requests.append(request.url.path)
+            page = {"index": 0, "markdown": "Page", "images": [], "dimensions": None}
+            return httpx.Response(
+                200,
+                json={"pages": [page], "model": "mistral-ocr-latest", "usage_info": {"pages_processed": 1}},
+            )
+
+    class MockAsyncClient(httpx.AsyncClient):
+        def __init__(self, **kwargs):
+            super().__init__(transport=LoopBoundTransport(), **kwargs)
+
+    # The SDK opens its own httpx.AsyncClient; route it to the mock transport
+    monkeypatch.setattr(httpx, "AsyncClient", MockAsyncClient)
+    paths = [pdf_file(f"{i}.pdf") for i in range(2)]
+
+    for _ in range(2):
+        results = asyncio.run(aload_pdfs(paths))
+        assert [docs[0].page_content for docs in results] == ["Page", "Page"]
+
+    assert requests == ["/v1/ocr"] * 4
+
+
+def test_safe_pdf_loader_retries_transient_errors(pdf_file, mistral_client, monkeypatch):
+    """Test that a transient OCR failure is retried and a permanent one is not"""
+
+    class APIError(Exception):
+        def __init__(self, status_code):
+            super().__init__(f"API error occurred: Status {status_code}")
+            self.status_code = status_code
+
+    monkeypatch.setattr(document_loader.time, "sleep", lambda _: None)
+    client = mistral_client(ocr__process=[APIError(503), ocr_response("Recovered")])
+
+    docs = SafePyPDFLoader(pdf_file()).load()
+
+    assert client.names() == ["ocr.process", "ocr.process"]
+    assert docs[0].page_content == "Recovered"
+    assert document_loader._is_transient(APIError(429))
+    assert not document_loader._is_transient(APIError(401))
+
+
+def test_retry_delay_caps_server_retry_after():
+    """Test that a long Retry-After header is clamped to the maximum backoff"""
+    error = Exception("rate limited")
+    error.raw_response = httpx.Response(429, headers={"Retry-After": "3600"})
+    assert document_loader._retry_delay(error, attempt=1) == document_loader._RETRY_MAX_WAIT
+
+    error.raw_response = httpx.Response(429, headers={"Retry-After": "2"})
+    assert document_loader._retry_delay(error, attempt=1) == 2.0
+
+
+def test_rate_limiter_spaces_requests_beyond_burst():
+    """Test that the OCR token bucket only delays requests past its burst size"""
+    from app.utils.document_loader import _RateLimiter
+
+    limiter = _RateLimiter(max_rate=2, time_period=1)
+    assert limiter._reserve() == 0.0
+    assert limiter._reserve() == 0.0
+    assert limiter._reserve() > 0.0
+
+    assert _RateLimiter(max_rate=0)._reserve() == 0.0
+
+
+def test_safe_pdf_loader_caches_by_content(tmp_path, pdf_file, mistral_client, monkeypatch):
+    """Test that a second load of identical PDF bytes is served from the OCR cache"""
+    monkeypatch.setattr(document_loader, "_OCR_CACHE", _OCRCache(str(tmp_path / "cache")))
+    client = mistral_client(ocr__process=ocr_response("Cached page"))
+
+    SafePyPDFLoader(pdf_file("first.pdf")).load()
+    second_path = pdf_file("second.pdf")
+    docs = SafePyPDFLoader(second_path).load()
+
+    assert client.names() == ["ocr.process"]
+    assert docs[0].page_content == "Cached page"
+    assert docs[0].metadata == {
+        "source": second_path,
+        "page": 1,
+        "extraction_method": "mistral_ocr",
+    }
+
+
+def test_ocr_cache_removes_temp_file_on_write_failure(tmp_path):
+    """Test that a failed cache write does not leave a temp file behind"""
+    cache_dir = tmp_path / "cache"
+    cache = _OCRCache(str(cache_dir))
+
+    cache.set("mistral_ocr:model:digest", [{"page_content": object()}])
+
+    assert list(cache_dir.iterdir()) == []
+    assert cache.get("mistral_ocr:model:digest") is None
+
+
+def test_safe_pdf_loader_uploads_large_files(pdf_file, mistral_client, cleanup_pool, monkeypatch):
+    """Test that PDFs over the inline limit are uploaded, OCRed by signed URL and deleted"""
+    monkeypatch.setattr(document_loader, "MISTRAL_OCR_INLINE_MAX_BYTES", 4)
+    uploaded = []
+
+    def upload(file, purpose):
+        uploaded.append((file["file_name"], file["content"].read(), purpose))
+        return SimpleNamespace(id="file-1")
+
+    client = mistral_client(
+        files__upload=upload,
+        files__get_signed_url=SimpleNamespace(url="https://signed.example/file-1"),
+        ocr__process=ocr_response("Uploaded"),
+    )
+
+    docs = SafePyPDFLoader(pdf_file("large.pdf", b"%PDF-1.4 large upload")).load()
+    cleanup_pool.shutdown(wait=True)
+
+    assert docs[0].page_content == "Uploaded"
+    assert uploaded == [("large.pdf", b"%PDF-1.4 large upload", "ocr")]
+    assert client.names() == ["files.upload", "files.get_signed_url", "ocr.process", "files.delete"]
+    assert client.calls[2][1]["document"]["document_url"] == "https://signed.example/file-1"
+    assert client.calls[3][1] == {"file_id": "file-1"}
+
+
+def test_safe_pdf_loader_lazy_load(pdf_file, mistral_client):
+    """Test that lazy_load yields page documents one at a time"""
+    mistral_client(ocr__process=ocr_response("One", "Two"))
+
+    pages = SafePyPDFLoader(pdf_file()).lazy_load()
+
+    assert next(pages).page_content == "One"
+    assert next(pages).page_content == "Two"
+    assert next(pages, None) is None
+
+
+def test_safe_pdf_loader_reuses_mistral_client(monkeypatch):
+    """Test that loaders share one Mistral client per API key"""
+    pytest.importorskip("mistralai")
+    monkeypatch.setattr(document_loader, "MISTRAL_API_KEY", "test-key")
+
+    first = SafePyPDFLoader("first.pdf")._get_client()
+    second = SafePyPDFLoader("second.pdf")._get_client()
+    assert first is second
+
+    async def async_clients():
+        return (
+            SafePyPDFLoader("first.pdf")._get_async_client(),
+            SafePyPDFLoader("second.pdf")._get_async_client(),
+        )
+
+    # Async clients are shared within an event loop but never across loops
+    first_loop = asyncio.run(async_clients())
+    second_loop = asyncio.run(async_clients())
+    assert first_loop[0] is first_loop[1]
+    assert first_loop[0] is not second_loop[0]
+
+
+def test_safe_pdf_loader_batch_load(pdf_file, mistral_client, cleanup_pool, monkeypatch):
+    """Test that batch_load submits one OCR batch job and maps results back to files"""
+    monkeypatch.setattr(document_loader.time, "sleep", lambda _: None)
+    monkeypatch.setattr(document_loader, "MISTRAL_OCR_INLINE_MAX_BYTES", 20)
+    submitted = []
+
+    def upload(file, purpose):
+        if purpose == "ocr":
+            return SimpleNamespace(id="pdf-upload")
+        assert purpose == "batch"
+        submitted.extend(json.loads(line) for line in file["content"].read().splitlines())
+        return SimpleNamespace(id="batch-input")
+
+    def download(file_id):
+        assert file_id == "batch-output"
+        lines = [
+            {"custom_id": request["custom_id"], "response": {"status_code": 200, "body": ocr_response(f"Page of {request['custom_id']}")}}
+            for request in submitted
+        ]
+        return httpx.Response(200, text="\n".join(json.dumps(line) for line in lines))
+
+    client = mistral_client(
+        files__upload=upload,
+        files__download=download,
+        files__get_signed_url=SimpleNamespace(url="https://files.example/second.pdf"),
+        batch__jobs__create=SimpleNamespace(id="job-1", status="QUEUED", output_file=None),
+        batch__jobs__get=SimpleNamespace(
+            id="job-1", status="SUCCESS", output_file="batch-output", error_file=None
+        ),
+    )
+    first_path = pdf_file("first.pdf", b"%PDF-1.4 batch first")
+    second_path = pdf_file("second.pdf", b"%PDF-1.4 batch second")
+
+    docs = list(SafePyPDFLoader.batch_load([first_path, second_path]))
+    cleanup_pool.shutdown(wait=True)
+
+    assert [d.page_content for d in docs] == ["Page of 0", "Page of 1"]
+    assert [d.metadata["source"] for d in docs] == [first_path, second_path]
+    create_kwargs = dict(client.calls)["batch.jobs.create"]
+    assert create_kwargs["input_files"] == ["batch-input"]
+    assert create_kwargs["endpoint"] == "/v1/ocr"
+    # The larger file is uploaded and must stay readable for as long as the job can run
+    assert submitted[1]["body"]["document"]["document_url"] == "https://files.example/second.pdf"
+    assert dict(client.calls)["files.get_signed_url"]["expiry"] > create_kwargs["timeout_hours"]
+    deleted = sorted(kwargs["file_id"] for name, kwargs in client.calls if name == "files.delete")
+    assert deleted == ["batch-input", "batch-output", "pdf-upload"]
+
+
+def test_safe_pdf_loader_batch_load_reports_failed_files(pdf_file, mistral_client, cleanup_pool, monkeypatch):
+    """Test that files in the error file or missing from the output raise after the successes"""
+    monkeypatch.setattr(document_loader.time, "sleep", lambda _: None)
+
+    def batch_file(*records):
+        return httpx.Response(200, text="\n".join(json.dumps(record) for record in records))
+
+    output = batch_file({"custom_id": "0", "response": {"status_code": 200, "body": ocr_response("OK")}})
+    errors = batch_file({"custom_id": "1", "error": {"message": "Document could not be read"}})
+    mistral_client(
+        files__upload=SimpleNamespace(id="batch-input"),
+        files__download=lambda file_id: {"batch-output": output, "batch-errors": errors}[file_id],
+        batch__jobs__create=SimpleNamespace(
+            id="job-1", status="SUCCESS", output_file="batch-output", error_file="batch-errors"
+        ),
+    )
+    paths = [pdf_file(f"{i}.pdf", f"%PDF-1.4 batch {i}".encode()) for i in range(3)]
+
+    docs = SafePyPDFLoader.batch_load(paths)
+    assert next(docs).page_content == "OK"
+    with pytest.raises(RuntimeError) as exc_info:
+        next(docs)
+
+    message = str(exc_info.value)
+    assert "failed for 2 of 3 files" in message
+    assert f"{paths[1]}: {{'message': 'Document could not be read'}}" in message
+    assert f"{paths[2]}: no result returned" in message
+    assert output.is_closed and errors.is_closed
+
+
+def test_safe_pdf_loader_batch_load_never_retries_unconfirmed_job_create(pdf_file, mistral_client, cleanup_pool, monkeypatch):
+    """Test that batch job creation is retried after a 429 but not after a dropped connection"""
+
+    class APIError(Exception):
+        def __init__(self, status_code):
+            super().__init__(f"API error occurred: Status {status_code}")
+            self.status_code = status_code
+
+    monkeypatch.setattr(document_loader.time, "sleep", lambda _: None)
+    client = mistral_client(
+        files__upload=SimpleNamespace(id="batch-input"),
+        batch__jobs__create=[APIError(429), httpx.ConnectError("connection reset")],
+    )
+
+    with pytest.raises(httpx.ConnectError):
+        list(SafePyPDFLoader.batch_load([pdf_file()]))
+
+    assert client.names().count("batch.jobs.create") == 2
+
+
+def _make_text_pdf(*texts: str) -> bytes:
+    """Build a minimal PDF with one page per string; empty strings give pages without text."""
+    page_ids = [4 + 2 * i for i in range(len(texts))]
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [%s] /Count %d >>"
+        % (b" ".join(b"%d 0 R" % page_id for page_id in page_ids), len(texts)),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for page_id, text in zip(page_ids, texts):
+        content = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode() if text else b""
+        objects += [
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents %d 0 R"
+            b" /Resources << /Font << /F1 3 0 R >> >> >>" % (page_id + 1),
+            b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream",
+        ]
+    pdf = b"%PDF-1.4\n"
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += b"%d 0 obj\n" % number + obj + b"\nendobj\n"
+    xref = len(pdf)
+    pdf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    pdf += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    pdf += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref,
+    )
+    return pdf
+
+
+def test_safe_pdf_loader_skips_ocr_for_text_pdfs(pdf_file, mistral_client):
+    """Test that PDFs with an extractable text layer are read locally without OCR"""
+    path = pdf_file("digital.pdf", _make_text_pdf("Born digital text " * 10))
+    client = mistral_client()
+
+    docs = SafePyPDFLoader(path).load()
+
+    assert client.calls == []
+    assert len(docs) == 1
+    assert "Born digital text" in docs[0].page_content
+    assert docs[0].metadata == {
+        "source": path,
+        "page": 1,
+        "extraction_method": "pypdf_fast_path",
+    }
+
+
+def test_safe_pdf_loader_ocrs_pdfs_with_scanned_pages_after_text(pdf_file, mistral_client):
+    """Test that blank pages after typed ones send the whole PDF to OCR"""
+    typed = "Typed cover page text " * 5
+    path = pdf_file("mixed.pdf", _make_text_pdf(typed, typed, typed, ""))
+    client = mistral_client(ocr__process=ocr_response("One", "Two", "Three", "Scanned four"))
+
+    docs = SafePyPDFLoader(path).load()
+
+    assert client.names() == ["ocr.process"]
+    assert docs[3].page_content == "Scanned four"
+    assert {d.metadata["extraction_method"] for d in docs} == {"mistral_ocr"}
+
+
+def test_quick_text_probe_scales_threshold_to_short_pdfs(tmp_path, monkeypatch):
+    """Test that a one-page PDF only needs its share of the text threshold"""
+    from pypdf import PdfReader
+
+    monkeypatch.setattr(document_loader, "PDF_MIN_TEXT_THRESHOLD", 90)
+
+    file_path = tmp_path / "short.pdf"
+    file_path.write_bytes(_make_text_pdf("Forty characters of text on one page..."))
+    loader = SafePyPDFLoader(str(file_path))
+    reader = PdfReader(str(file_path))
+
+    assert loader._quick_text_probe(reader, max_pages=3) is not None
+    assert loader._quick_text_probe(reader, max_pages=1) is None